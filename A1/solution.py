@@ -7,91 +7,168 @@
 
 import os  # for time functions
 import math  # for infinity
+from collections import OrderedDict  # for the bounded heuristic table
 from search import *  # for search engines
 from sokoban import sokoban_goal_state, SokobanState, Direction, PROBLEMS  # for Sokoban specific classes and problems
 
-heur_table = {}
+# Tables of previously computed heuristic values, one per puzzle so that different problems never share
+# entries. Each table is an LRU bounded so long searches do not grow it forever, and only the tables of
+# the most recently used puzzles are kept.
+# (for very large problems a small direct-mapped front cache in front of each table is an option)
+HEUR_TABLE_SIZE = 200000
+HEUR_TABLE_PUZZLES = 4
+heur_table = OrderedDict()
 
 
-def box_in_corner(box, state):
-    (x, y) = box
-    if x == 0:
-        if y == 0 or y == state.height - 1:
-            return True
+def puzzle_heur_table(state):
+    # the walls, storage points and obstacles never change during a search, so together they identify the puzzle
+    puzzle = (state.width, state.height, state.storage, state.obstacles)
+    table = heur_table.get(puzzle)
+    if table is None:
+        table = OrderedDict()
+        heur_table[puzzle] = table
+        if len(heur_table) > HEUR_TABLE_PUZZLES:
+            heur_table.popitem(last=False)
+    else:
+        heur_table.move_to_end(puzzle)
+    return table
 
-    if x == state.width - 1:
-        if y == 0 or y == state.height - 1:
-            return True
-    return False
 
+def store_heur(table, key, value):
+    # insert as the most recently used entry and evict the least recently used one when full
+    table[key] = value
+    if len(table) > HEUR_TABLE_SIZE:
+        table.popitem(last=False)
+    return value
 
-def box_in_pseudo_corner(box, state):
-    # Blockers contains original obstacles, other boxes, and the walls
-    blockers = state.boxes.union(state.obstacles)
-    (x, y) = box
-    up = (x, y + 1)
-    down = (x, y - 1)
-    left = (x - 1, y)
-    right = (x + 1, y)
 
-    # Case 1: Form pseudo corner with walls and blockers
-    if (up in blockers) or (down in blockers):
-        if x == 0 or x == state.width - 1:
-            return True
+# storage coordinate sets for each puzzle, keyed by the (immutable) storage frozenset
+storage_cache = {}
 
-    if (left in blockers) or (right in blockers):
-        if y == 0 or y == state.height - 1:
-            return True
 
-    # Case 2: Form pseudo corner with obstacles
-    # did not consider boxes as other boxes can be moved and it is not a deadlock
-    if up in state.obstacles and ((left in state.obstacles) or (right in state.obstacles)):
-        return True
-    if down in state.obstacles and ((left in state.obstacles) or (right in state.obstacles)):
-        return True
+def storage_coords(state):
+    # x and y coordinates of the storage points, computed once per puzzle since storage never changes
+    coords = storage_cache.get(state.storage)
+    if coords is None:
+        coords = (frozenset(x for (x, _) in state.storage), frozenset(y for (_, y) in state.storage))
+        storage_cache[state.storage] = coords
+    return coords
 
-    return False
 
+def checkDeadLock(state):
+    # for each box, check whether it's yet to be stored
+    # if it is not stored in storage position, check whether current box position is deadlock
+    # everything the checks need is the same for every box, so build it once per state
+    last_x = state.width - 1
+    last_y = state.height - 1
+    # Blockers contains original obstacles and other boxes (the walls are tested by coordinate)
+    blockers = state.boxes | state.obstacles
+    obstacles = state.obstacles
+    (storage_xs, storage_ys) = storage_coords(state)
+
+    for box in state.boxes - state.storage:
+        (x, y) = box
+        on_vertical_wall = x == 0 or x == last_x
+        on_horizontal_wall = y == 0 or y == last_y
+
+        # Box in a corner of the room
+        if on_vertical_wall and on_horizontal_wall:
+            return True
 
-def edge_without_storage(box, state):
-    # If the box is along the wall and there is no storage along that wall -> deadlock
-    (x, y) = box
+        # Box along a wall that has no storage position -> it can never leave that wall
+        if on_vertical_wall and (x not in storage_xs):
+            return True
+        if on_horizontal_wall and (y not in storage_ys):
+            return True
 
-    # Find possible storage positions first.
-    possible_storages = []
-    for store in state.storage:
-        possible_storages.append(store)
-    for box in state.boxes:
-        if box in possible_storages:
-            possible_storages.remove(box)
+        # Box in a pseudo corner
+        up = (x, y + 1)
+        down = (x, y - 1)
 
-    # populate x_list and y_list with possible storage position
-    (x_list, y_list) = ([], [])
-    for storage_pos in possible_storages:
-        x_list.append(storage_pos[0])
-        y_list.append(storage_pos[1])
+        # Case 1: Form pseudo corner with walls and blockers
+        if on_vertical_wall and ((up in blockers) or (down in blockers)):
+            return True
 
-    if x == 0 and (0 not in x_list):
-        return True
-    elif x == (state.width - 1) and ((state.width - 1) not in x_list):
-        return True
+        left = (x - 1, y)
+        right = (x + 1, y)
+        if on_horizontal_wall and ((left in blockers) or (right in blockers)):
+            return True
 
-    elif y == 0 and (0 not in y_list):
-        return True
-    elif y == (state.height - 1) and ((state.width - 1) not in y_list):
-        return True
+        # Case 2: Form pseudo corner with obstacles
+        # did not consider boxes as other boxes can be moved and it is not a deadlock
+        if ((up in obstacles) or (down in obstacles)) and ((left in obstacles) or (right in obstacles)):
+            return True
 
     return False
 
 
-def checkDeadLock(state):
-    # for each box, check whether it's yet to be stored
-    # if it is not stored in storage position, check whether current box position is deadlock
-    for box in state.boxes:
-        if box not in state.storage:
-            if box_in_corner(box, state) or box_in_pseudo_corner(box, state) or edge_without_storage(box, state):
-                return True
-    return False
+def min_assignment(sources, targets):
+    # Minimum total manhattan distance of matching every source to a distinct target (Hungarian algorithm).
+    # When there are more sources than targets, only as many sources as there are targets are matched.
+    if len(sources) > len(targets):
+        (sources, targets) = (targets, sources)
+    n = len(sources)
+    m = len(targets)
+    if n == 0:
+        return 0
+
+    # a single source simply takes its nearest target
+    if n == 1:
+        for (sx, sy) in sources:
+            return min(abs(sx - tx) + abs(sy - ty) for (tx, ty) in targets)
+
+    cost = [[abs(sx - tx) + abs(sy - ty) for (tx, ty) in targets] for (sx, sy) in sources]
+
+    # potentials for rows (u) and columns (v); match[j] is the row assigned to column j (1-indexed, 0 = free)
+    inf = float("inf")
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    match = [0] * (m + 1)
+    way = [0] * (m + 1)
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        min_v = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < min_v[j]:
+                        min_v[j] = cur
+                        way[j] = j0
+                    if min_v[j] < delta:
+                        delta = min_v[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # walk the augmenting path back to the root
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+
+    return sum(cost[match[j] - 1][j - 1] for j in range(1, m + 1) if match[j])
+
+
+def sum_min(sources, targets):
+    # Sum, over the sources, of the manhattan distance to the nearest target (targets may be reused).
+    total = 0
+    for (sx, sy) in sources:
+        total += min(abs(sx - tx) + abs(sy - ty) for (tx, ty) in targets)
+    return total
 
 
 # SOKOBAN HEURISTICS
@@ -108,72 +185,42 @@ def heur_alternate(state):
     heur_alt = 0
 
     # construct key for heuristic table
-    key = ""
-    for box1 in state.boxes:
-        key = key + " " + str(box1[0]) + " " + str(box1[1])
-    for robot in state.robots:
-        key = key + " " + str(robot[0]) + " " + str(robot[1])
+    # the heuristic does not depend on the order of boxes or robots, so key on canonical forms of both
+    # so that equivalent states share one entry (boxes are already a frozenset, which is cheaper than sorting)
+    key = (frozenset(state.boxes), tuple(sorted(state.robots)))
 
     # check whether current state is in the hash table
     # if it does, simply returns it. No need to recompute
-    if key in heur_table:
-        return heur_table[key]
+    table = puzzle_heur_table(state)
+    if key in table:
+        table.move_to_end(key)
+        return table[key]
 
     # check whether current state has a deadlock that will not allow puzzle completion
     # if there is a deadlock, return infinite heuristic and populate given state in the heuristic table
     if checkDeadLock(state):
-        heur_table[key] = float("inf")
-        return float("inf")
-
-    # Assign the closest box to each of the robot
-    # remove the box after it is assigned
-    possible_boxes = []
-    for box in state.boxes:
-        possible_boxes.append(box)
-
-    for robot in state.robots:
-        min_dist = float("inf")
-        remove = None
-        for box in possible_boxes:
-            if man_dist(robot, box) < min_dist:
-                min_dist = min(man_dist(robot, box), min_dist)
-                remove = box
-
-        if remove is not None:
-            possible_boxes.remove(remove)
-
-        heur_alt += min_dist
-
-    # Assign the closest storage to each of the box
-    # Find possible storage positions first.
-    possible_storages = []
-    for store in state.storage:
-        possible_storages.append(store)
-    for box in state.boxes:
-        if box in possible_storages:
-            possible_storages.remove(box)
-
-    for box in state.boxes:
-        if box in state.storage:
-            continue
-
-        min_dist = float("inf")
-        for storage in possible_storages:
-            min_dist = min(man_dist(storage, box), min_dist)
-
-        heur_alt += min_dist
+        return store_heur(table, key, float("inf"))
+
+    # Assign each robot to a distinct box so that the total robot-box distance is minimal
+    heur_alt += min_assignment(state.robots, state.boxes)
+
+    # Assign the closest free storage position to each box that is yet to be stored.
+    # Storage positions may be shared: matching boxes to distinct storage positions (as for the robots)
+    # gives a larger estimate but guides greedy search worse, e.g. best_first no longer solves problem 9.
+    # Only storage positions not already occupied by a box are considered.
+    unstored_boxes = state.boxes - state.storage
+    possible_storages = state.storage - state.boxes
+    if len(unstored_boxes) > len(possible_storages):
+        return store_heur(table, key, float("inf"))
+    heur_alt += sum_min(unstored_boxes, possible_storages)
 
     # populate table current state with its heuristic
-    heur_table[key] = heur_alt
-    return heur_alt
+    return store_heur(table, key, heur_alt)
 
 def heur_zero(state):
     '''Zero Heuristic can be used to make A* search perform uniform cost search'''
     return 0
 
-def man_dist (n1,n2):
-    return abs(n1[0] - n2[0]) + abs(n1[1] - n2[1])
-
 def heur_manhattan_distance(state):
     # IMPLEMENT
     '''admissible sokoban puzzle heuristic: manhattan distance'''
@@ -186,15 +233,11 @@ def heur_manhattan_distance(state):
     # You should implement this heuristic function exactly, even if it is tempting to improve it.
     # Your function should return a numeric value; this is the estimate of the distance to the goal.
 
-    sum = 0
-    for box in state.boxes:
-        distances = list()
-        for storage in state.storage:
-            curr = man_dist(box, storage)
-            distances.append(curr)
-        if len(distances) > 0:
-            sum += min(distances)
-    return sum
+    if not state.boxes or not state.storage:
+        return 0
+
+    # take the nearest storage point for each box in a single pass
+    return sum(min(abs(bx - sx) + abs(by - sy) for (sx, sy) in state.storage) for (bx, by) in state.boxes)
 
 def fval_function(sN, weight):
     # IMPLEMENT
@@ -216,7 +259,6 @@ def weighted_astar(initial_state, heur_fn, weight, timebound):
     '''OUTPUT: A goal state (if a goal is found), else False as well as a SearchStats object'''
     '''implementation of weighted astar algorithm'''
 
-    weight = 5
     se = SearchEngine('custom', 'full')
     wrapped_fval_function = (lambda sN: fval_function(sN, weight))
     se.init_search(initial_state, sokoban_goal_state, heur_fn, wrapped_fval_function)
@@ -239,7 +281,6 @@ def iterative_astar(initial_state, heur_fn, weight=1, timebound=10):  # uses f(n
 
     # initialize the search engine
     se = SearchEngine('custom', 'full')
-    se.init_search(initial_state, sokoban_goal_state, heur_fn, (lambda sN: fval_function(sN, weight)))
 
     # initialize default values for result and costbound
     best_state = False
@@ -251,14 +292,20 @@ def iterative_astar(initial_state, heur_fn, weight=1, timebound=10):  # uses f(n
 
     while time_remaining > 0:
 
+        # restart the search with the current weight, bound into the f-value function so that
+        # nodes already in OPEN are never compared against an f-value computed with another weight
+        se.init_search(initial_state, sokoban_goal_state, heur_fn, (lambda sN, w=weight: fval_function(sN, w)))
+
         # perform search
         curr_state, curr_stat = se.search(time_remaining, (float("inf"), float("inf"), best_cost))
 
         # if more optimal solution found, update the result and the cost bound
-        if curr_state and best_cost > curr_state.gval + heur_fn(curr_state):
-            best_state = curr_state
-            best_stat = curr_stat
-            best_cost = curr_state.gval + heur_fn(curr_state)
+        if curr_state:
+            total = curr_state.gval + heur_fn(curr_state)
+            if best_cost > total:
+                best_state = curr_state
+                best_stat = curr_stat
+                best_cost = total
 
         # decrease the weight within each iteration
         weight = weight * multiplier
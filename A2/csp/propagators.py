@@ -59,6 +59,7 @@
 
          for gac we initialize the GAC queue with all constraints containing V.
    """
+from collections import deque
 
 
 def prop_BT(csp, newVar=None):
@@ -86,13 +87,13 @@ def prop_FC(csp, newVar=None):
     pruned_vals = []
 
     if not newVar:
-        list = csp.get_all_cons()
+        cons_to_process = csp.get_all_cons()
     else:
-        list = csp.get_cons_with_var(newVar)
+        cons_to_process = csp.get_cons_with_var(newVar)
 
-    for con in list:
-        if con.get_n_unasgn() == 1:
-            unassigned = con.get_unasgn_vars()
+    for con in cons_to_process:
+        unassigned = con.get_unasgn_vars()
+        if len(unassigned) == 1:
             dwo, pruned = FCCheck(con, unassigned[0])
             pruned_vals += pruned
 
@@ -107,26 +108,32 @@ def FCCheck(c, x):
     pruned_vals = []
 
     # c is a constraint with all its variables already assigned, except for x
+    # its scope and the assigned values do not change while checking x, so build them once
+    constraint_vars = c.get_scope()
+    valued_assigned = []
+    x_index = 0
+    for i, var in enumerate(constraint_vars):
+        if var == x:
+            x_index = i
+            valued_assigned.append(None)
+        else:
+            valued_assigned.append(var.get_assigned_value())
+
+    check = c.check
+    prune = x.prune_value
+
+    # check if making x = constraint_var together with previous
+    # assignments to variables in scope C falsify C
     for domain_member in x.cur_domain():
-        constraint_vars = c.get_scope()
-        valued_assigned = []
-
-        # check if making x = constraint_var together with previous
-        # assignments to variables in scope C falsify C
-        for var in constraint_vars:
-            if var == x:
-                valued_assigned.append(domain_member)
-            else:
-                assigned_val = var.get_assigned_value()
-                valued_assigned.append(assigned_val)
-
-        if c.check(valued_assigned) is False:
+        valued_assigned[x_index] = domain_member
+
+        if check(valued_assigned) is False:
             pruned_vals.append((x, domain_member))
-            x.prune_value(domain_member)
+            prune(domain_member)
 
-        # Constraint was falsified. DWO.
-        if not x.cur_domain():
-            return True, pruned_vals
+            # Constraint was falsified. DWO.
+            if not x.cur_domain_size():
+                return True, pruned_vals
 
     return False, pruned_vals
 
@@ -136,15 +143,13 @@ def prop_GAC(csp, newVar=None):
        processing all constraints. Otherwise we do GAC enforce with
        constraints containing newVar on GAC Queue"""
 
-    queue = []
-
     if not newVar:
-        list = csp.get_all_cons()
+        cons_to_process = csp.get_all_cons()
     else:
-        list = csp.get_cons_with_var(newVar)
+        cons_to_process = csp.get_cons_with_var(newVar)
 
-    for con in list:
-        queue = [con] + queue
+    # GAC processes the queue from the front, in the same order as the constraints are listed
+    queue = list(cons_to_process)
 
     dwo, pruned_vals = GAC(queue, csp)
 
@@ -158,15 +163,21 @@ def GAC(queue, csp):
     # queue contains all constraints one of whose variables has had its domain reduced.
     # At the root of search tree, first we run GAC with all contraints on queue
 
+    # FIFO queue of constraints, with a set for constant time membership tests
+    queue = deque(queue)
+    in_queue = set(queue)
+
     pruned_vals = []
     while queue:
-        c = queue.pop()
+        c = queue.popleft()
+        in_queue.discard(c)
         all_constraints = c.get_scope()
+        has_support = c.has_support
         for constraint in all_constraints:
             for curr in constraint.cur_domain():
 
                 # when a value pair does not have supporting tuple
-                if c.has_support(constraint, curr) is False:
+                if has_support(constraint, curr) is False:
 
                     # append to pruned_vals list
                     # remove value from constraints
@@ -177,8 +188,9 @@ def GAC(queue, csp):
                     # return DWO if current domain is empty
                     if constraint.cur_domain():
                         for constr in csp.get_cons_with_var(constraint):
-                            if constr not in queue:
-                                queue = [constr] + queue
+                            if constr not in in_queue:
+                                queue.append(constr)
+                                in_queue.add(constr)
                     else:
                         return True, pruned_vals
 
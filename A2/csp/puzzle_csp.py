@@ -31,6 +31,9 @@ The grid-only models do not need to encode the cage constraints.
 from cspbase import *
 import itertools
 
+# satisfying tuples of a binary not-equal constraint, shared by every constraint of the same grid size
+ne_tuples_cache = {}
+
 
 def binary_ne_grid(fpuzz_grid):
     size = fpuzz_grid[0][0]
@@ -39,7 +42,6 @@ def binary_ne_grid(fpuzz_grid):
     variables = []
 
     cons = []
-    sat_tuples = []
 
     # create variables for each position in the grid
     # use a 2d list variables to store all variables
@@ -52,24 +54,24 @@ def binary_ne_grid(fpuzz_grid):
             var_list.append(newVar)
         variables.append(temp)
 
-    # create satisfying tuples list where v1 != v2
-    for t in itertools.product(list(range(1, size + 1)), list(range(1, size + 1))):
-        if not t[0] == t[1]:
-            sat_tuples.append(t)
+    # create satisfying tuples list where v1 != v2, once per grid size
+    if size not in ne_tuples_cache:
+        values = range(1, size + 1)
+        ne_tuples_cache[size] = tuple((a, b) for a in values for b in values if a != b)
+    sat_tuples = ne_tuples_cache[size]
 
     # for each pair of variables, create a binary constraint and add satisfying tuples
     for i in range(size):
-        for j in range(size):
-            for k in range(j + 1, size):
-                # constraints in each row
-                con = Constraint("Row %d %d%d" % (i, j, k), [variables[i][j], variables[i][k]])
-                con.add_satisfying_tuples(sat_tuples)
-                cons.append(con)
-
-                # constraints in each column
-                con = Constraint("Column %d %d%d" % (i, j, k), [variables[j][i], variables[k][i]])
-                con.add_satisfying_tuples(sat_tuples)
-                cons.append(con)
+        for j, k in itertools.combinations(range(size), 2):
+            # constraints in each row
+            con = Constraint("Row %d %d%d" % (i, j, k), [variables[i][j], variables[i][k]])
+            con.add_satisfying_tuples(sat_tuples)
+            cons.append(con)
+
+            # constraints in each column
+            con = Constraint("Column %d %d%d" % (i, j, k), [variables[j][i], variables[k][i]])
+            con.add_satisfying_tuples(sat_tuples)
+            cons.append(con)
 
     # create csp model and add constraint
     csp = CSP("binary", var_list)
@@ -155,6 +157,7 @@ def caged_csp_model(fpuzz_grid):
             target = cage[-2]
             cage_vars = []
             domain = []
+            cells = []
 
             # find variables in current cage
             # find domain of variables for each position in the current cage
@@ -163,12 +166,25 @@ def caged_csp_model(fpuzz_grid):
                 col = int(str(cage[j])[1]) - 1
                 cage_vars.append(variables[row][col])
                 domain.append(variables[row][col].domain())
+                cells.append((row, col))
+
+            # pairs of cage cells sharing a row or a column can never hold the same value
+            same_rc_pairs = [(a, b) for a, b in itertools.combinations(range(len(cells)), 2)
+                             if cells[a][0] == cells[b][0] or cells[a][1] == cells[b][1]]
 
             con = Constraint("Cage %d" % i, cage_vars)
             prod_domain = itertools.product(*domain)
             cage_tuple = []
 
+            # subtraction and division only depend on the multiset of values in the cage,
+            # so remember the result for each sorted tuple instead of re-trying its permutations
+            multiset_ok = {}
+
             for dom in prod_domain:
+                # skip tuples already ruled out by the row and column constraints
+                if any(dom[a] == dom[b] for a, b in same_rc_pairs):
+                    continue
+
                 # addition
                 if operation == 0:
                     sum = 0
@@ -178,25 +194,26 @@ def caged_csp_model(fpuzz_grid):
                     if sum == target:
                         cage_tuple.append(dom)
 
-                # subtraction
-                elif operation == 1:
-                    for num in itertools.permutations(dom):
-                        sub = num[0]
-                        for n in range(1, len(num)):
-                            sub -= num[n]
-
-                        if sub == target:
-                            cage_tuple.append(dom)
-
-                # division
-                elif operation == 2:
-                    for num in itertools.permutations(dom):
-                        quotient = num[0]
-                        for n in range(1, len(num)):
-                            quotient = quotient / num[n]
-
-                        if quotient == target:
-                            cage_tuple.append(dom)
+                # subtraction and division
+                elif operation == 1 or operation == 2:
+                    values = tuple(sorted(dom))
+                    if values not in multiset_ok:
+                        multiset_ok[values] = False
+                        for num in itertools.permutations(values):
+                            result = num[0]
+                            for n in range(1, len(num)):
+                                if operation == 1:
+                                    result -= num[n]
+                                else:
+                                    result = result / num[n]
+
+                            # one satisfying order is enough
+                            if result == target:
+                                multiset_ok[values] = True
+                                break
+
+                    if multiset_ok[values]:
+                        cage_tuple.append(dom)
 
                 # multiplication
                 elif operation == 3:
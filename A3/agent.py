@@ -2,14 +2,24 @@
 An AI player for Othello. 
 """
 
+import ast
 import random
 import sys
 import time
+from collections import OrderedDict
+from operator import itemgetter
 
 # You can use the functions in othello_shared to write your AI
 from othello_shared import find_lines, get_possible_moves, get_score, play_move
 
 
+INF = float('inf')
+NEG_INF = -INF
+
+# opponent of each player color
+OPP = {1: 2, 2: 1}
+
+
 def eprint(*args, **kwargs):  # you can use this for debugging, as it will print to sterr and not stdout
     print(*args, file=sys.stderr, **kwargs)
 
@@ -28,113 +38,340 @@ def compute_heuristic(board, color):  # not implemented, optional
     # 1. Consider number of possible moves
     # 2. Check current score
     # 3. Check whether it is corner or on the side. Provide a multiplier for this condition
-    size = len(board) - 1
-    opponent = 1 if color == 2 else 2
-    score = compute_utility(board, color)
-    corner = 0
-    side = 0
+    # (counted on bitboards, with the corner and edge squares of each board size precomputed in get_bb_tables)
+    tables = get_bb_tables(len(board))
+    dark, light = board_to_bb(board)
+    own, opp = (dark, light) if color == 1 else (light, dark)
+    score = compute_utility_bb(dark, light, color)
 
     # opponent's possible moves: -2x multiplier
-    opponent_moves = get_possible_moves(board, opponent)
+    opponent_moves = bin(get_possible_moves_bb(opp, own, tables)).count("1")
 
     # possible moves: 3x multiplier
-    moves = get_possible_moves(board, color)
+    moves = bin(get_possible_moves_bb(own, opp, tables)).count("1")
 
     # corner: 5x multiplier
-    if board[0][0] == color or board[0][size] == color or board[size][0] == color or board[size][size] == color:
-        corner += 1
+    corner = 1 if own & tables[3] else 0
 
-    # side: 2x multiplier
-    for i in range(len(board)):
-        for j in range(len(board)):
-            if board[0][j] == color or board[i][0] == color or board[i][size] == color or board[size][j] == color:
-                side += 1
+    # side: 2x multiplier (edge squares other than the corners)
+    side = bin(own & tables[4]).count("1")
 
-    heuristic = score + 3 * len(moves) + 5 * corner + 2 * side - 2 * len(opponent_moves)
+    heuristic = score + 3 * moves + 5 * corner + 2 * side - 2 * opponent_moves
     return heuristic
 
 
+# flags telling how a cached utility relates to the true utility of a board
+EXACT = 0
+LOWER = 1  # the true utility is at least the cached one (the search failed high)
+UPPER = 2  # the true utility is at most the cached one (the search failed low)
+
+
+# most entries each table of the state cache keeps; it lives across turns, so the least recently used entries
+# are evicted. An entry of the cache and of its best moves together take about 500 bytes, so when both tables
+# are full the state cache holds about 130 MB.
+TT_SIZE = 1 << 18
+
+
+class TranspositionTable:
+    """
+    State cache for the searches. Entries are keyed by the board, the player
+    color, whether color is the one to move and the remaining depth, and hold
+    the best move, its utility and a flag telling whether the utility is exact
+    or only a bound (alpha-beta cutoffs only produce bounds). Separately, it
+    keeps the best move found for each board, which node ordering tries first.
+    The cache is kept from one turn to the next and each table holds at most
+    size entries, dropping the least recently used ones.
+    """
+
+    def __init__(self, size=TT_SIZE):
+        self.size = size
+        self.table = OrderedDict()
+        # best move found for a board at any depth, tried first when the board is searched again
+        self.best_moves = OrderedDict()
+
+    def clear_best_moves(self):
+        # a search without caching must not order its moves by the best moves of earlier searches
+        self.best_moves.clear()
+
+    def probe(self, key, alpha=NEG_INF, beta=INF):
+        # return (move, util) if the cached entry settles the search in the window (alpha, beta), else None
+        entry = self.table.get(key)
+        if entry is None:
+            return None
+        self.table.move_to_end(key)
+        move, util, flag = entry
+        if flag == EXACT or (flag == LOWER and util >= beta) or (flag == UPPER and util <= alpha):
+            return move, util
+        return None
+
+    def store(self, key, move, util, flag=EXACT):
+        store_lru(self.table, key, (move, util, flag), self.size)
+
+    def store_best_move(self, key, move):
+        # keys end with the remaining depth, the best move is kept for the board regardless of depth
+        store_lru(self.best_moves, key[:-1], move, self.size)
+
+    def best_move(self, key):
+        return self.best_moves.get(key[:-1])
+
+
+def store_lru(table, key, value, size):
+    # insert or refresh key in the OrderedDict table, evicting the oldest entry beyond size
+    table[key] = value
+    table.move_to_end(key)
+    if len(table) > size:
+        table.popitem(last=False)
+
+
 # global variable to implement state caching
-visited = {}
+visited = TranspositionTable()
+
+
+############ BITBOARDS #############################
+# The search represents a board as two integers (bitboards), one for the dark
+# and one for the light disks. The square in column i and row j is bit i * n + j,
+# so walking the bits from lowest to highest visits the squares in the same
+# order as get_possible_moves.
+# The two bitboards also make the state cache key: (dark, light, color,
+# whether color moves, depth) is built with no work per square, cannot
+# collide (unlike a Zobrist hash, whose incremental updates would cost an xor
+# per flipped disk here), and hashing a short tuple of ints is about as fast
+# as looking up one int.
+
+# per board size: (n, shifts and masks for the 8 directions, square of each bit, corner squares, other edge squares)
+bb_tables = {}
+
+
+def get_bb_tables(n):
+    tables = bb_tables.get(n)
+    if tables is None:
+        full = (1 << (n * n)) - 1
+        first_row = 0
+        last_row = 0
+        for i in range(n):
+            first_row |= 1 << (i * n)
+            last_row |= 1 << (i * n + n - 1)
+
+        directions = []
+        for di, dj in [(0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)]:
+            # moving one row down (up) must not wrap into the first (last) row of the next column
+            mask = full
+            if dj == 1:
+                mask &= ~first_row
+            elif dj == -1:
+                mask &= ~last_row
+            directions.append((di * n + dj, mask))
+
+        # (i, j) square of every single-bit bitboard
+        squares = {}
+        for i in range(n):
+            for j in range(n):
+                squares[1 << (i * n + j)] = (i, j)
+
+        # the four corners, and the other squares on the edges of the board
+        last = n - 1
+        corners = (1 << 0) | (1 << last) | (1 << (last * n)) | (1 << (last * n + last))
+        edges = (first_row | last_row | ((1 << n) - 1) | (((1 << n) - 1) << (last * n))) & ~corners
+
+        tables = (n, directions, squares, corners, edges)
+        bb_tables[n] = tables
+    return tables
+
+
+def board_to_bb(board):
+    # convert a list-of-rows board into (dark, light) bitboards
+    # (this runs once per search, the nodes key the state cache on the bitboards themselves)
+    n = len(board)
+    dark = 0
+    light = 0
+    for j, row in enumerate(board):
+        for i, square in enumerate(row):
+            if square == 1:
+                dark |= 1 << (i * n + j)
+            elif square == 2:
+                light |= 1 << (i * n + j)
+    return dark, light
+
+
+def get_possible_moves_bb(own, opp, tables):
+    # bitboard of all squares where the player owning own can play
+    directions = tables[1]
+    empty = ~(own | opp)
+    moves = 0
+    for shift, mask in directions:
+        # walk from own disks over runs of opponent disks, an empty square right after a run is a move
+        if shift > 0:
+            x = (own << shift) & mask & opp
+            while x:
+                x = (x << shift) & mask
+                moves |= x & empty
+                x &= opp
+        else:
+            x = (own >> -shift) & mask & opp
+            while x:
+                x = (x >> -shift) & mask
+                moves |= x & empty
+                x &= opp
+    return moves
+
+
+def get_flips_bb(own, opp, move, tables):
+    # bitboard of the opponent disks captured when own plays on the square move (a single bit)
+    directions = tables[1]
+    flips = 0
+    for shift, mask in directions:
+        line = 0
+        if shift > 0:
+            x = (move << shift) & mask & opp
+            while x:
+                line |= x
+                x = (x << shift) & mask
+                if x & own:
+                    flips |= line
+                    break
+                x &= opp
+        else:
+            x = (move >> -shift) & mask & opp
+            while x:
+                line |= x
+                x = (x >> -shift) & mask
+                if x & own:
+                    flips |= line
+                    break
+                x &= opp
+    return flips
+
+
+def list_moves_bb(moves, tables):
+    # split a bitboard of moves into (bit, (i, j)) pairs, in the order of get_possible_moves
+    squares = tables[2]
+    result = []
+    while moves:
+        bit = moves & -moves
+        result.append((bit, squares[bit]))
+        moves ^= bit
+    return result
+
+
+def play_move_bb(dark, light, player, move, tables):
+    # return the (dark, light) bitboards after player plays on the square move
+    if player == 1:
+        flips = get_flips_bb(dark, light, move, tables)
+        return dark | move | flips, light & ~flips
+    else:
+        flips = get_flips_bb(light, dark, move, tables)
+        return dark & ~flips, light | move | flips
+
+
+def compute_utility_bb(dark, light, color):
+    # same as compute_utility, counting set bits instead of squares
+    score = bin(dark).count("1") - bin(light).count("1")
+    return score if color == 1 else -score
 
 
 ############ MINIMAX ###############################
-def minimax_min_node(board, color, limit, caching=0):
+def minimax_min_bb(dark, light, color, limit, caching, tables):
+    # depth limit reached: evaluate without generating moves (depth 0 is never cached, so skip the probe)
+    if limit == 0:
+        return None, compute_utility_bb(dark, light, color)
+
     # if caching is enabled and board is visited, return directly
     if caching:
-        key = tuple(map(tuple, board))
-        if key in visited:
-            return visited[key]
+        key = (dark, light, color, False, limit)
+        entry = visited.probe(key)
+        if entry is not None:
+            return entry
 
     # get opponent
-    opponent = 2 if (color == 1) else 1
+    opponent = OPP[color]
 
     # get opponent's possible moves
-    moves = get_possible_moves(board, opponent)
+    if opponent == 1:
+        moves = get_possible_moves_bb(dark, light, tables)
+    else:
+        moves = get_possible_moves_bb(light, dark, tables)
 
-    if len(moves) == 0 or limit == 0:
-        return None, compute_utility(board, color)
+    if not moves:
+        return None, compute_utility_bb(dark, light, color)
 
-    min_util = float('inf')
+    min_util = INF
+    next_limit = limit - 1
     best_move = None
 
-    for move in moves:
+    for bit, move in list_moves_bb(moves, tables):
 
         # play the move and get an updated board
-        temp_board = play_move(board, opponent, move[0], move[1])
+        temp_dark, temp_light = play_move_bb(dark, light, opponent, bit, tables)
 
         # recursive call
-        _, util = minimax_max_node(temp_board, color, limit - 1, caching)
+        _, util = minimax_max_bb(temp_dark, temp_light, color, next_limit, caching, tables)
 
         # update
         if util < min_util:
             min_util = util
             best_move = move
 
-        # if caching enabled, mark the board as visited
-        if caching:
-            key = tuple(map(tuple, temp_board))
-            visited[key] = (move, util)
+    # if caching enabled, mark the board as visited
+    if caching:
+        visited.store(key, best_move, min_util)
 
     return best_move, min_util
 
 
-def minimax_max_node(board, color, limit, caching=0):  # returns highest possible utility
+def minimax_max_bb(dark, light, color, limit, caching, tables):  # returns highest possible utility
+    # depth limit reached: evaluate without generating moves (depth 0 is never cached, so skip the probe)
+    if limit == 0:
+        return None, compute_utility_bb(dark, light, color)
+
     # if caching is enabled and board is visited, return directly
     if caching:
-        key = tuple(map(tuple, board))
-        if key in visited:
-            return visited[key]
+        key = (dark, light, color, True, limit)
+        entry = visited.probe(key)
+        if entry is not None:
+            return entry
 
     # get possible moves
-    moves = get_possible_moves(board, color)
+    if color == 1:
+        moves = get_possible_moves_bb(dark, light, tables)
+    else:
+        moves = get_possible_moves_bb(light, dark, tables)
 
-    if len(moves) == 0 or limit == 0:
-        return None, compute_utility(board, color)
+    if not moves:
+        return None, compute_utility_bb(dark, light, color)
 
-    max_util = -float('inf')
+    max_util = NEG_INF
+    next_limit = limit - 1
     best_move = None
 
-    for move in moves:
+    for bit, move in list_moves_bb(moves, tables):
         # play the move and get an updated board
-        temp_board = play_move(board, color, move[0], move[1])
+        temp_dark, temp_light = play_move_bb(dark, light, color, bit, tables)
 
         # recursive call
-        _, util = minimax_min_node(temp_board, color, limit - 1, caching)
+        _, util = minimax_min_bb(temp_dark, temp_light, color, next_limit, caching, tables)
 
         # update
         if util > max_util:
             max_util = util
             best_move = move
 
-        # if caching enabled, mark the board as visited
-        if caching:
-            key = tuple(map(tuple, temp_board))
-            visited[key] = (move, util)
+    # if caching enabled, mark the board as visited
+    if caching:
+        visited.store(key, best_move, max_util)
 
     return best_move, max_util
 
 
+def minimax_min_node(board, color, limit, caching=0):
+    dark, light = board_to_bb(board)
+    return minimax_min_bb(dark, light, color, limit, caching, get_bb_tables(len(board)))
+
+
+def minimax_max_node(board, color, limit, caching=0):  # returns highest possible utility
+    dark, light = board_to_bb(board)
+    return minimax_max_bb(dark, light, color, limit, caching, get_bb_tables(len(board)))
+
+
 def select_move_minimax(board, color, limit, caching=0):
     """
     Given a board and a player color, decide on a move. 
@@ -148,107 +385,247 @@ def select_move_minimax(board, color, limit, caching=0):
     If caching is ON (i.e. 1), use state caching to reduce the number of state evaluations.
     If caching is OFF (i.e. 0), do NOT use state caching to reduce the number of state evaluations.    
     """
-    visited.clear()
     move, util = minimax_max_node(board, color, limit, caching)
     return move
 
 
 ############ ALPHA-BETA PRUNING #####################
-def alphabeta_min_node(board, color, alpha, beta, limit, caching=0, ordering=0):
-
-    # if caching is enabled and board is visited, return directly
+def bound_flag(util, alpha, beta):
+    # how the utility returned by a search in the window (alpha, beta) relates to the true utility
+    if util <= alpha:
+        return UPPER
+    if util >= beta:
+        return LOWER
+    return EXACT
+
+
+# Move ordering state, reset at every select_move_alphabeta call.
+# killers: per ply (distance from the root), the last two moves that caused a cutoff there
+# history: per player, how much each move has caused cutoffs, weighted by the square of the depth left below it
+killers = {}
+history = {1: {}, 2: {}}
+
+# nodes with at least this much depth left order their moves by 1-ply utility, deeper nodes by history
+UTILITY_ORDER_DEPTH = 3
+
+
+def order_best_first(children, best_move):
+    # move the child (score, move, bit, board) of best_move (if present) to the front
+    if best_move is None:
+        return
+    for index, child in enumerate(children):
+        if child[1] == best_move:
+            if index:
+                children.insert(0, children.pop(index))
+            return
+
+
+def depth_left(dark, light, limit, tables):
+    # depth left below a node: the depth limit, or in an unbounded search (limit < 0) the number of empty
+    # squares, since every move fills one and a side with no moves ends the search
+    if limit >= 0:
+        return limit
+    n = tables[0]
+    return n * n - bin(dark | light).count("1")
+
+
+def order_children(dark, light, player, moves, key, ply, limit, tables):
+    # yield (move, board after the move) for the moves of player in the order they should be searched:
+    # the best move found when the board was last searched first, then the killer moves, then the rest
+    if depth_left(dark, light, limit, tables) >= UTILITY_ORDER_DEPTH:
+        # close to the root: sort by the number of disks flipped, which orders the moves exactly as the
+        # utility after the move would (it is the parent utility plus twice the flips)
+        own, opp = (dark, light) if player == 1 else (light, dark)
+        children = []
+        for bit, move in moves:
+            flips = get_flips_bb(own, opp, bit, tables)
+            if player == 1:
+                board = dark | bit | flips, light & ~flips
+            else:
+                board = dark & ~flips, light | bit | flips
+            children.append((bin(flips).count("1"), move, bit, board))
+    else:
+        # deeper: sort by history, so moves are only played when (and if) they are searched
+        scores = history[player]
+        children = [(scores.get(move, 0), move, bit, None) for bit, move in moves]
+    # sort on the score alone; the sort is stable, so ties keep the order of get_possible_moves
+    children.sort(key=itemgetter(0), reverse=True)
+
+    for killer in reversed(killers.get(ply, ())):
+        order_best_first(children, killer)
+    order_best_first(children, visited.best_move(key))
+
+    for _, move, bit, board in children:
+        yield move, (board if board is not None else play_move_bb(dark, light, player, bit, tables))
+
+
+def record_cutoff(player, move, ply, depth):
+    # remember a move of player that caused a cutoff at ply with depth left below it
+    slots = killers.get(ply)
+    if slots is None:
+        killers[ply] = [move]
+    elif move not in slots:
+        killers[ply] = [move, slots[0]]
+    scores = history[player]
+    scores[move] = scores.get(move, 0) + depth * depth
+
+
+def play_children(dark, light, player, moves, tables):
+    # yield (move, board after the move) in the given order; without ordering, only the moves that are reached
+    # before a cutoff are played
+    for bit, move in moves:
+        yield move, play_move_bb(dark, light, player, bit, tables)
+
+
+def alphabeta_min_bb(dark, light, color, alpha, beta, limit, caching, ordering, tables, ply=0):
+    # depth limit reached: evaluate without generating moves (depth 0 is never cached, so skip the probe)
+    if limit == 0:
+        return None, compute_utility_bb(dark, light, color)
+
+    # if caching is enabled and the cached result for the board settles this node, return directly
+    alpha_orig = alpha
+    beta_orig = beta
+    key = (dark, light, color, False, limit)
     if caching:
-        key = tuple(map(tuple, board))
-        if key in visited:
-            return visited[key]
+        entry = visited.probe(key, alpha, beta)
+        if entry is not None:
+            return entry
 
     # get opponents
-    opponent = 2 if color == 1 else 1
+    opponent = OPP[color]
 
     # get opponent's possible moves
-    moves = get_possible_moves(board, opponent)
+    if opponent == 1:
+        moves = list_moves_bb(get_possible_moves_bb(dark, light, tables), tables)
+    else:
+        moves = list_moves_bb(get_possible_moves_bb(light, dark, tables), tables)
 
-    if len(moves) == 0 or limit == 0:
-        return None, compute_utility(board, color)
+    if len(moves) == 0:
+        # the opponent has no moves: the utility is exact whatever the depth left
+        util = compute_utility_bb(dark, light, color)
+        if caching:
+            visited.store(key, None, util)
+        return None, util
 
-    min_util = float('inf')
+    min_util = INF
+    next_limit = limit - 1
+    next_ply = ply + 1
     best_move = None
 
-    # order the moves for maximum utility possible for opponent
+    # order the moves of the opponent (see order_children)
     if ordering:
-        moves.sort(key=lambda m: compute_utility(play_move(board, opponent, m[0], m[1]), opponent), reverse=True)
-
-    for move in moves:
+        children = order_children(dark, light, opponent, moves, key, ply, limit, tables)
+    else:
+        children = play_children(dark, light, opponent, moves, tables)
 
-        # play the move and get an updated board
-        temp_board = play_move(board, opponent, move[0], move[1])
+    # each child is a move with the board it leads to
+    for move, (temp_dark, temp_light) in children:
 
         # recursive call
-        _, util = alphabeta_max_node(temp_board, color, alpha, beta, limit - 1, caching, ordering)
+        _, util = alphabeta_max_bb(temp_dark, temp_light, color, alpha, beta, next_limit, caching, ordering, tables,
+                                   next_ply)
 
         # update
-        if util <  min_util:
+        if util < min_util:
             min_util = util
             best_move = move
 
-        # if caching enabled, mark the board as visited
-        if caching:
-            key = tuple(map(tuple, temp_board))
-            visited[key] = (move, util)
-
         # update beta
         beta = min(beta, util)
         if beta <= alpha:
+            if ordering:
+                record_cutoff(opponent, move, ply, depth_left(dark, light, limit, tables))
             break
 
+    # cache the result, remembering whether it is only a bound
+    # (with ordering on, the best move is also kept for later searches of the board to try first)
+    if caching:
+        visited.store(key, best_move, min_util, bound_flag(min_util, alpha_orig, beta_orig))
+    if ordering and best_move is not None:
+        visited.store_best_move(key, best_move)
+
     return best_move, min_util
 
 
-def alphabeta_max_node(board, color, alpha, beta, limit, caching=0, ordering=0):
+def alphabeta_max_bb(dark, light, color, alpha, beta, limit, caching, ordering, tables, ply=0):
+    # depth limit reached: evaluate without generating moves (depth 0 is never cached, so skip the probe)
+    if limit == 0:
+        return None, compute_utility_bb(dark, light, color)
 
-    # if caching is enabled and board is visited, return directly
+    # if caching is enabled and the cached result for the board settles this node, return directly
+    alpha_orig = alpha
+    beta_orig = beta
+    key = (dark, light, color, True, limit)
     if caching:
-        key = tuple(map(tuple, board))
-        if key in visited:
-            return visited[key]
+        entry = visited.probe(key, alpha, beta)
+        if entry is not None:
+            return entry
 
-    moves = get_possible_moves(board, color)
+    if color == 1:
+        moves = list_moves_bb(get_possible_moves_bb(dark, light, tables), tables)
+    else:
+        moves = list_moves_bb(get_possible_moves_bb(light, dark, tables), tables)
 
-    if len(moves) == 0 or limit == 0:
-        return None, compute_utility(board, color)
+    if len(moves) == 0:
+        # no moves: the utility is exact whatever the depth left
+        util = compute_utility_bb(dark, light, color)
+        if caching:
+            visited.store(key, None, util)
+        return None, util
 
-    # order the moves according to maximum utility possible
+    # order the moves (see order_children)
     if ordering:
-        moves.sort(key=lambda m: compute_utility(play_move(board, color, m[0], m[1]), color), reverse=True)
+        children = order_children(dark, light, color, moves, key, ply, limit, tables)
+    else:
+        children = play_children(dark, light, color, moves, tables)
 
-    max_util = -float('inf')
+    max_util = NEG_INF
+    next_limit = limit - 1
+    next_ply = ply + 1
     best_move = None
 
-    for move in moves:
-        # play the move and get an updated board
-        temp_board = play_move(board, color, move[0], move[1])
-
+    # each child is a move with the board it leads to
+    for move, (temp_dark, temp_light) in children:
         # recursive call
-        _, util = alphabeta_min_node(temp_board, color, alpha, beta, limit - 1, caching, ordering)
+        _, util = alphabeta_min_bb(temp_dark, temp_light, color, alpha, beta, next_limit, caching, ordering, tables,
+                                   next_ply)
 
         # update
         if util > max_util:
             max_util = util
             best_move = move
 
-        # if caching enabled, mark the board as visited
-        if caching:
-            key = tuple(map(tuple, temp_board))
-            visited[key] = (move, util)
-
         # update alpha
         alpha = max(alpha, util)
         if beta <= alpha:
+            if ordering:
+                record_cutoff(color, move, ply, depth_left(dark, light, limit, tables))
             break
 
+    # cache the result, remembering whether it is only a bound
+    # (with ordering on, the best move is also kept for later searches of the board to try first)
+    if caching:
+        visited.store(key, best_move, max_util, bound_flag(max_util, alpha_orig, beta_orig))
+    if ordering and best_move is not None:
+        visited.store_best_move(key, best_move)
+
     return best_move, max_util
 
 
+def alphabeta_min_node(board, color, alpha, beta, limit, caching=0, ordering=0):
+    if not caching:
+        visited.clear_best_moves()
+    dark, light = board_to_bb(board)
+    return alphabeta_min_bb(dark, light, color, alpha, beta, limit, caching, ordering, get_bb_tables(len(board)))
+
+
+def alphabeta_max_node(board, color, alpha, beta, limit, caching=0, ordering=0):
+    if not caching:
+        visited.clear_best_moves()
+    dark, light = board_to_bb(board)
+    return alphabeta_max_bb(dark, light, color, alpha, beta, limit, caching, ordering, get_bb_tables(len(board)))
+
+
 def select_move_alphabeta(board, color, limit, caching=0, ordering=0):
     """
     Given a board and a player color, decide on a move. 
@@ -264,8 +641,11 @@ def select_move_alphabeta(board, color, limit, caching=0, ordering=0):
     If ordering is ON (i.e. 1), use node ordering to expedite pruning and reduce the number of state evaluations. 
     If ordering is OFF (i.e. 0), do NOT use node ordering to expedite pruning and reduce the number of state evaluations. 
     """
-    visited.clear()
-    move, util = alphabeta_max_node(board, color, -float('inf'), float('inf'), limit, caching, ordering)
+    killers.clear()
+    history[1].clear()
+    history[2].clear()
+
+    move, util = alphabeta_max_node(board, color, NEG_INF, INF, limit, caching, ordering)
     return move
 
 
@@ -320,7 +700,7 @@ def run_ai():
         if status == "FINAL":  # Game is over.
             print
         else:
-            board = eval(input())  # Read in the input and turn it into a Python
+            board = ast.literal_eval(input())  # Read in the input and turn it into a Python
             # object. The format is a list of rows. The
             # squares in each row are represented by
             # 0 : empty square